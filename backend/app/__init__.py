@@ -3,6 +3,7 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from pymongo import MongoClient
 from app.config import Config
+from app.middleware.profiling import init_profiling
 
 # Initialize MongoDB client
 mongo_client = None
@@ -22,6 +23,9 @@ def create_app():
     # Initialize JWT
     jwt.init_app(app)
     
+    # Initialize opt-in request profiling
+    init_profiling(app)
+    
     # Initialize MongoDB connection
     mongo_client = MongoClient(app.config['MONGO_URI'])
     db = mongo_client[app.config['MONGO_DB_NAME']]
@@ -34,10 +38,12 @@ def create_app():
     from app.routes.auth import auth_bp
     from app.routes.overlays import overlays_bp
     from app.routes.settings import settings_bp
+    from app.routes.profiles import profiles_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(overlays_bp, url_prefix='/api/overlays')
     app.register_blueprint(settings_bp, url_prefix='/api/settings')
+    app.register_blueprint(profiles_bp, url_prefix='/api/profiles')
     
     # Health check endpoint
     @app.route('/api/health')
@@ -32,3 +32,15 @@ class Config:
     
     # CORS settings
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:5173,http://localhost:3000').split(',')
+    
+    # Profiling settings (opt-in, per request)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False').lower() == 'true'
+    PROFILING_TOKEN = os.getenv('PROFILING_TOKEN', '')
+    PROFILING_HEADER = os.getenv('PROFILING_HEADER', 'X-Profile-Token')
+    PROFILING_DIR = os.getenv(  # made absolute in init_profiling
+        'PROFILING_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'profiles')
+    )
+    PROFILING_MODE = os.getenv('PROFILING_MODE', 'sampling')  # 'sampling' or 'cprofile'
+    PROFILING_SAMPLE_INTERVAL = float(os.getenv('PROFILING_SAMPLE_INTERVAL', '0.005'))  # seconds
+    PROFILING_MAX_PROFILES = int(os.getenv('PROFILING_MAX_PROFILES', '20'))
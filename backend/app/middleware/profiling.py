@@ -0,0 +1,233 @@
+import cProfile
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from flask import g, request
+
+PROFILE_ID_PATTERN = re.compile(r'^\d+-[0-9a-f]{8}$')
+PROFILE_FORMATS = {'cprofile': 'prof', 'sampling': 'folded'}
+
+# Only one request is profiled at a time so the overhead stays bounded
+_profile_lock = threading.Lock()
+_store_lock = threading.Lock()
+
+
+class StackSampler:
+    """Sample the stack of a single thread into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            self._sample()
+            if self._stop.wait(self.interval):
+                break
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename == __file__:
+                # The thread is starting or stopping the profiler, not serving the request
+                return
+            stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        if stack:
+            self.samples[';'.join(reversed(stack))] += 1
+
+    def dump(self, path: str):
+        """Write samples in the collapsed format read by flamegraph.pl and speedscope."""
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+def profiling_enabled(config) -> bool:
+    """Profiling needs both the feature flag and a shared token."""
+    return bool(config.get('PROFILING_ENABLED') and config.get('PROFILING_TOKEN'))
+
+
+def is_authorized(config) -> bool:
+    """Check the profiling token header on the current request."""
+    if not profiling_enabled(config):
+        return False
+    token = request.headers.get(config['PROFILING_HEADER'], '')
+    return hmac.compare_digest(token.encode('utf-8'), config['PROFILING_TOKEN'].encode('utf-8'))
+
+
+def init_profiling(app):
+    """Register request hooks that profile requests carrying the profiling token."""
+    if not profiling_enabled(app.config):
+        return
+
+    # Resolved here rather than in Config so overrides via app.config are covered too;
+    # send_file resolves relative paths against the app root, not the working directory
+    app.config['PROFILING_DIR'] = os.path.abspath(app.config['PROFILING_DIR'])
+
+    mode = app.config.get('PROFILING_MODE', 'sampling')
+    if mode not in PROFILE_FORMATS:
+        raise ValueError(f'Invalid PROFILING_MODE "{mode}". Must be "cprofile" or "sampling"')
+    if mode == 'cprofile' and sys.version_info >= (3, 12):
+        # cProfile moved to sys.monitoring in 3.12, which records calls from every thread
+        app.logger.warning(
+            'PROFILING_MODE=cprofile records all threads on Python 3.12+; profiles will include '
+            'concurrent requests. Use PROFILING_MODE=sampling for single-request profiles.'
+        )
+
+    @app.before_request
+    def start_profile():
+        if request.path.startswith('/api/profiles') or not is_authorized(app.config):
+            return
+        if not _profile_lock.acquire(blocking=False):
+            return
+
+        try:
+            if mode == 'cprofile':
+                profiler = cProfile.Profile()
+                profiler.enable()
+            else:
+                profiler = StackSampler(threading.get_ident(), app.config['PROFILING_SAMPLE_INTERVAL'])
+                profiler.start()
+        except (ValueError, RuntimeError):
+            # Another profiler is active (3.12+) or no thread could be started; serve unprofiled
+            _profile_lock.release()
+            app.logger.exception('Failed to start request profiler')
+            return
+
+        g.profiler = profiler
+        g.profile_spans = []
+        g.profile_start = time.perf_counter()
+
+    @app.after_request
+    def finish_profile(response):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return response
+
+        try:
+            if mode == 'cprofile':
+                profiler.disable()
+            else:
+                profiler.stop()
+            duration_ms = round((time.perf_counter() - g.profile_start) * 1000, 3)
+            spans = g.profile_spans
+
+            try:
+                profile_id = save_profile(app.config, profiler, mode, {
+                    'method': request.method,
+                    'path': request.path,
+                    'status': response.status_code,
+                    'duration_ms': duration_ms,
+                    'spans': spans
+                })
+            except OSError:
+                app.logger.exception('Failed to save request profile')
+                return response
+
+            response.headers['X-Profile-Id'] = profile_id
+            response.headers['Server-Timing'] = ', '.join(
+                [f'total;dur={duration_ms}'] +
+                [f'{span["name"]};dur={span["duration_ms"]}' for span in spans]
+            )
+        finally:
+            _profile_lock.release()
+
+        return response
+
+    @app.teardown_request
+    def abort_profile(exc):
+        # after_request is skipped on unhandled errors; make sure the profiler is stopped
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return
+        if mode == 'cprofile':
+            profiler.disable()
+        else:
+            profiler.stop()
+        _profile_lock.release()
+
+
+def save_profile(config, profiler, mode: str, meta: dict) -> str:
+    """Write a profile and its metadata, evicting the oldest beyond the ring size."""
+    profile_dir = config['PROFILING_DIR']
+    profile_id = f'{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}'
+    filename = f'{profile_id}.{PROFILE_FORMATS[mode]}'
+
+    with _store_lock:
+        os.makedirs(profile_dir, exist_ok=True)
+
+        if mode == 'cprofile':
+            profiler.dump_stats(os.path.join(profile_dir, filename))
+        else:
+            profiler.dump(os.path.join(profile_dir, filename))
+
+        meta = {
+            'id': profile_id,
+            'format': mode,
+            'scope': 'process' if mode == 'cprofile' and sys.version_info >= (3, 12) else 'request',
+            'file': filename,
+            'created_at': datetime.utcnow().isoformat(),
+            **meta
+        }
+        with open(os.path.join(profile_dir, f'{profile_id}.json'), 'w') as f:
+            json.dump(meta, f)
+
+        # Ids start with a millisecond timestamp, so name order is age order
+        profile_ids = sorted(name[:-5] for name in os.listdir(profile_dir) if name.endswith('.json'))
+        for old_id in profile_ids[:-max(config['PROFILING_MAX_PROFILES'], 1)]:
+            for ext in ['json', *PROFILE_FORMATS.values()]:
+                path = os.path.join(profile_dir, f'{old_id}.{ext}')
+                if os.path.exists(path):
+                    os.remove(path)
+
+    return profile_id
+
+
+def list_profiles(config) -> list:
+    """List stored profile metadata, newest first."""
+    profile_dir = config['PROFILING_DIR']
+    if not os.path.isdir(profile_dir):
+        return []
+
+    profiles = []
+    for name in sorted(os.listdir(profile_dir), reverse=True):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(profile_dir, name)) as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            # Evicted or half-written while listing
+            continue
+    return profiles
+
+
+def get_profile(config, profile_id: str) -> dict | None:
+    """Get metadata for a stored profile."""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    try:
+        with open(os.path.join(config['PROFILING_DIR'], f'{profile_id}.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
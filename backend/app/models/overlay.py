@@ -1,5 +1,6 @@
 from datetime import datetime
 from bson import ObjectId
+from app.utils.timing import timed
 
 
 class OverlayModel:
@@ -8,6 +9,7 @@ class OverlayModel:
     def __init__(self, db):
         self.collection = db.overlays
     
+    @timed('OverlayModel.create_overlay')
     def create_overlay(self, user_id: str, overlay_data: dict) -> dict:
         """Create a new overlay."""
         overlay_doc = {
@@ -38,11 +40,13 @@ class OverlayModel:
         overlay_doc['_id'] = result.inserted_id
         return self._serialize_overlay(overlay_doc)
     
+    @timed('OverlayModel.get_overlays_by_user')
     def get_overlays_by_user(self, user_id: str) -> list:
         """Get all overlays for a user."""
         overlays = self.collection.find({'user_id': user_id}).sort('created_at', -1)
         return [self._serialize_overlay(overlay) for overlay in overlays]
     
+    @timed('OverlayModel.get_overlay_by_id')
     def get_overlay_by_id(self, overlay_id: str, user_id: str) -> dict | None:
         """Get a single overlay by ID."""
         try:
@@ -54,6 +58,7 @@ class OverlayModel:
         except Exception:
             return None
     
+    @timed('OverlayModel.update_overlay')
     def update_overlay(self, overlay_id: str, user_id: str, update_data: dict) -> dict | None:
         """Update an overlay."""
         try:
@@ -96,6 +101,7 @@ class OverlayModel:
         except Exception:
             return None
     
+    @timed('OverlayModel.delete_overlay')
     def delete_overlay(self, overlay_id: str, user_id: str) -> bool:
         """Delete an overlay."""
         try:
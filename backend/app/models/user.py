@@ -1,6 +1,7 @@
 from datetime import datetime
 from bson import ObjectId
 import bcrypt
+from app.utils.timing import timed
 
 
 class UserModel:
@@ -9,6 +10,7 @@ class UserModel:
     def __init__(self, db):
         self.collection = db.users
     
+    @timed('UserModel.create_user')
     def create_user(self, email: str, password: str, username: str) -> dict:
         """Create a new user with hashed password."""
         # Hash the password
@@ -27,11 +29,13 @@ class UserModel:
         user_doc['_id'] = result.inserted_id
         return self._serialize_user(user_doc)
     
+    @timed('UserModel.find_by_email')
     def find_by_email(self, email: str) -> dict | None:
         """Find a user by email."""
         user = self.collection.find_one({'email': email.lower().strip()})
         return user
     
+    @timed('UserModel.find_by_id')
     def find_by_id(self, user_id: str) -> dict | None:
         """Find a user by ID."""
         try:
@@ -40,6 +44,7 @@ class UserModel:
         except Exception:
             return None
     
+    @timed('UserModel.verify_password')
     def verify_password(self, user: dict, password: str) -> bool:
         """Verify user password."""
         if not user or 'password' not in user:
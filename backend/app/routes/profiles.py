@@ -0,0 +1,46 @@
+import os
+from flask import Blueprint, current_app, jsonify, send_file
+from app.middleware.profiling import get_profile, is_authorized, list_profiles
+
+profiles_bp = Blueprint('profiles', __name__)
+
+
+@profiles_bp.before_request
+def require_profiling_token():
+    """Hide profile endpoints unless profiling is enabled and the token matches."""
+    if not is_authorized(current_app.config):
+        return jsonify({'error': 'Not found'}), 404
+
+
+@profiles_bp.route('', methods=['GET'])
+def get_profiles():
+    """List recent request profiles, newest first."""
+    try:
+        profiles = list_profiles(current_app.config)
+        
+        return jsonify({
+            'profiles': profiles,
+            'count': len(profiles)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@profiles_bp.route('/<profile_id>', methods=['GET'])
+def download_profile(profile_id):
+    """Download a single profile as pstats or collapsed-stack output."""
+    try:
+        profile = get_profile(current_app.config, profile_id)
+        
+        if not profile:
+            return jsonify({'error': 'Profile not found'}), 404
+        
+        path = os.path.join(current_app.config['PROFILING_DIR'], profile['file'])
+        if not os.path.exists(path):
+            return jsonify({'error': 'Profile not found'}), 404
+        
+        return send_file(path, as_attachment=True, download_name=profile['file'])
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,30 @@
+import time
+from functools import wraps
+from flask import g, has_request_context
+
+
+def timed(name: str):
+    """Record a timing span for the wrapped call on profiled requests.
+
+    Outside a profiled request this only costs a context check, so model
+    methods can stay decorated in production.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not has_request_context():
+                return func(*args, **kwargs)
+            spans = g.get('profile_spans')
+            if spans is None:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                spans.append({
+                    'name': name,
+                    'duration_ms': round((time.perf_counter() - start) * 1000, 3)
+                })
+        return wrapper
+    return decorator
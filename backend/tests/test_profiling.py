@@ -0,0 +1,184 @@
+import os
+import pstats
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+import pytest
+from bson import ObjectId
+from flask import Flask, g
+from flask_jwt_extended import create_access_token
+from app import create_app, get_db
+from app.config import Config
+from app.middleware import profiling
+from app.models.user import UserModel
+
+TOKEN = 's3cret'
+
+
+def make_app(monkeypatch, tmp_path, mode='sampling'):
+    """Create an app with profiling enabled and MongoDB mocked out."""
+    monkeypatch.setattr(Config, 'PROFILING_ENABLED', True)
+    monkeypatch.setattr(Config, 'PROFILING_TOKEN', TOKEN)
+    monkeypatch.setattr(Config, 'PROFILING_DIR', str(tmp_path))
+    monkeypatch.setattr(Config, 'PROFILING_MODE', mode)
+    monkeypatch.setattr(Config, 'PROFILING_MAX_PROFILES', 3)
+    
+    with patch('app.MongoClient', MagicMock()):
+        app = create_app()
+    
+    app.config['PROPAGATE_EXCEPTIONS'] = False
+    
+    @app.route('/api/boom')
+    def boom():
+        raise RuntimeError('boom')
+    
+    @app.route('/api/slow')
+    def slow_view():
+        time.sleep(0.03)
+        return {'status': 'ok'}
+    
+    return app
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    return make_app(monkeypatch, tmp_path)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def profile_files(app):
+    return sorted(os.listdir(app.config['PROFILING_DIR']))
+
+
+def test_request_without_token_is_not_profiled(app, client):
+    response = client.get('/api/health')
+    
+    assert response.status_code == 200
+    assert 'X-Profile-Id' not in response.headers
+    assert profile_files(app) == []
+
+
+def test_request_with_token_writes_profile_and_metadata(app, client):
+    response = client.get('/api/slow', headers={'X-Profile-Token': TOKEN})
+    
+    profile_id = response.headers['X-Profile-Id']
+    assert profile_files(app) == [f'{profile_id}.folded', f'{profile_id}.json']
+    with open(os.path.join(app.config['PROFILING_DIR'], f'{profile_id}.folded')) as f:
+        stacks = f.read()
+    assert 'slow_view (' in stacks
+    assert 'start_profile' not in stacks
+
+
+def test_ring_evicts_oldest_profiles(app, client):
+    profile_ids = [
+        client.get('/api/health', headers={'X-Profile-Token': TOKEN}).headers['X-Profile-Id']
+        for _ in range(5)
+    ]
+    
+    listed = client.get('/api/profiles', headers={'X-Profile-Token': TOKEN}).get_json()
+    assert listed['count'] == 3
+    assert [profile['id'] for profile in listed['profiles']] == sorted(profile_ids[-3:], reverse=True)
+    assert len(profile_files(app)) == 6
+
+
+def test_view_exception_releases_profile_lock(app, client):
+    response = client.get('/api/boom', headers={'X-Profile-Token': TOKEN})
+    
+    assert response.status_code == 500
+    assert not profiling._profile_lock.locked()
+    
+    response = client.get('/api/health', headers={'X-Profile-Token': TOKEN})
+    assert 'X-Profile-Id' in response.headers
+
+
+def test_profiler_start_failure_releases_profile_lock(app, client, monkeypatch):
+    def fail_start(self):
+        raise RuntimeError("can't start new thread")
+    
+    monkeypatch.setattr(profiling.StackSampler, 'start', fail_start)
+    response = client.get('/api/health', headers={'X-Profile-Token': TOKEN})
+    
+    assert response.status_code == 200
+    assert 'X-Profile-Id' not in response.headers
+    assert not profiling._profile_lock.locked()
+
+
+def test_profiles_endpoints_require_token(client):
+    assert client.get('/api/profiles').status_code == 404
+    assert client.get('/api/profiles', headers={'X-Profile-Token': 'wrong'}).status_code == 404
+
+
+def test_download_profile(app, client):
+    profile_id = client.get('/api/health', headers={'X-Profile-Token': TOKEN}).headers['X-Profile-Id']
+    
+    response = client.get(f'/api/profiles/{profile_id}', headers={'X-Profile-Token': TOKEN})
+    
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('profile_id', ['..%2F..%2Fetc%2Fpasswd', 'not-an-id', '123-XYZ'])
+def test_download_rejects_invalid_profile_ids(client, profile_id):
+    response = client.get(f'/api/profiles/{profile_id}', headers={'X-Profile-Token': TOKEN})
+    
+    assert response.status_code == 404
+
+
+def test_overlay_model_spans_are_recorded(app, client):
+    user_id = str(ObjectId())
+    get_db().overlays.find.return_value.sort.return_value = [{
+        '_id': ObjectId(),
+        'user_id': user_id,
+        'type': 'text',
+        'content': 'LIVE',
+        'position': {'x': 0, 'y': 0},
+        'size': {'width': 200, 'height': 50},
+        'created_at': datetime.utcnow(),
+        'updated_at': datetime.utcnow()
+    }]
+    with app.app_context():
+        access_token = create_access_token(identity=user_id)
+    
+    response = client.get('/api/overlays', headers={
+        'Authorization': f'Bearer {access_token}',
+        'X-Profile-Token': TOKEN
+    })
+    
+    assert response.status_code == 200
+    assert response.get_json()['count'] == 1
+    assert 'OverlayModel.get_overlays_by_user;dur=' in response.headers['Server-Timing']
+    
+    listed = client.get('/api/profiles', headers={'X-Profile-Token': TOKEN}).get_json()
+    spans = listed['profiles'][0]['spans']
+    assert [span['name'] for span in spans] == ['OverlayModel.get_overlays_by_user']
+
+
+def test_timed_records_nothing_outside_profiled_requests():
+    collection = MagicMock()
+    collection.users.find_one.return_value = {'email': 'a@b.co'}
+    user_model = UserModel(collection)
+    
+    assert user_model.find_by_email('a@b.co') == {'email': 'a@b.co'}
+    
+    with Flask(__name__).test_request_context('/api/auth/me'):
+        assert user_model.find_by_email('a@b.co') == {'email': 'a@b.co'}
+        assert 'profile_spans' not in g
+
+
+def test_unprofiled_request_has_no_server_timing(client):
+    response = client.get('/api/health')
+    
+    assert 'Server-Timing' not in response.headers
+
+
+def test_cprofile_mode_writes_pstats(monkeypatch, tmp_path):
+    app = make_app(monkeypatch, tmp_path, mode='cprofile')
+    
+    response = app.test_client().get('/api/slow', headers={'X-Profile-Token': TOKEN})
+    
+    profile_id = response.headers['X-Profile-Id']
+    stats = pstats.Stats(os.path.join(app.config['PROFILING_DIR'], f'{profile_id}.prof'))
+    assert any(func_name == 'slow_view' for _, _, func_name in stats.stats)